@@ -1,6 +1,8 @@
 """Compute"""
 
 from __future__ import annotations
+import heapq
+from collections import Counter, defaultdict
 from typing import Any, Union, Optional
 
 
@@ -10,18 +12,26 @@ class _Vertex:
     Each vertex item is either a string represents developer, genre, category, or tag.
 
     Instance Attributes:
-        - item: The data stored in this vertex with kind, representing
-        a developer, category, genre, or tag. For example: ("Action", "genre")
+        - item: The data stored in this vertex, representing
+        a developer, category, genre, or tag. For example: "Action"
         - kind: The type of this vertex: 'developer', 'category', 'genre' or 'tag'.
-        - neighbours: The vertices that are adjacent to this vertex.
+        - neighbours_by_kind: The vertices that are adjacent to this vertex, grouped by kind.
+        Maps kind to the set of adjacent vertices of that kind.
 
     Representation Invariants:
-        - self not in self.neighbours
+        - all(self not in vs for vs in self.neighbours_by_kind.values())
         - self.kind in {'developer', 'genre', 'category', 'tag'}
     """
     item: Any
     kind: str
-    neighbours: set[_GameVertex]
+    neighbours_by_kind: dict[str, set[_Vertex]]
+    # Private Instance Attributes:
+    #     - _kind_degrees:
+    #         A cache of kind_degree. Maps frozenset(kinds) to the number of neighbours of
+    #         those kinds, and is cleared whenever an edge is added.
+    _kind_degrees: dict[frozenset[str], int]
+
+    __slots__ = ('item', 'kind', 'neighbours_by_kind', '_kind_degrees')
 
     def __init__(self, item: Any, kind: str) -> None:
         """Initialize a new vertex with the given item and kind.
@@ -33,11 +43,31 @@ class _Vertex:
         """
         self.item = item
         self.kind = kind
-        self.neighbours = set()
+        self.neighbours_by_kind = {}
+        self._kind_degrees = {}
 
     def degree(self) -> int:
         """Return the degree of this vertex."""
-        return len(self.neighbours)
+        return sum(len(vs) for vs in self.neighbours_by_kind.values())
+
+    def get_neighbours(self) -> set[_Vertex]:
+        """Return the set of all vertices adjacent to this vertex."""
+        return set().union(*self.neighbours_by_kind.values())
+
+    def add_neighbour(self, neighbour: _Vertex) -> None:
+        """Add neighbour to the neighbours of this vertex, and clear the cached values that
+        depend on them.
+        """
+        self.neighbours_by_kind.setdefault(neighbour.kind, set()).add(neighbour)
+        self._kind_degrees.clear()
+
+    def kind_degree(self, kinds: frozenset[str]) -> int:
+        """Return the number of neighbours of this vertex whose kind is in kinds."""
+        if kinds not in self._kind_degrees:
+            self._kind_degrees[kinds] = \
+                sum(len(self.neighbours_by_kind.get(kind, ())) for kind in kinds)
+
+        return self._kind_degrees[kinds]
 
 
 class _GameVertex(_Vertex):
@@ -51,22 +81,30 @@ class _GameVertex(_Vertex):
         - price: The price of the game.
         - rating_score: The rating score of the game, calculated by
         positive ratings / (positive ratings + negative ratings).
-        - platform: The platform the game can be played.
-        - neighbours: The vertices that are adjacent to this vertex.
+        - platform: The platforms the game can be played on.
+        - neighbours_by_kind: The vertices that are adjacent to this vertex, grouped by kind.
+        Maps kind to the set of adjacent vertices of that kind.
 
     Representation Invariants:
-        - self not in self.neighbours
+        - all(self not in vs for vs in self.neighbours_by_kind.values())
         - self.kind == 'game'
     """
     item: Any
     kind: str
     price: float
     rating_score: float
-    platform: list[str]
-    neighbours: set[_Vertex]
+    platform: frozenset[str]
+    neighbours_by_kind: dict[str, set[_Vertex]]
+    # Private Instance Attributes:
+    #     - _filtered_neighbours:
+    #         A cache of the neighbours of this vertex whose kind is in the given kinds.
+    #         Maps frozenset(kinds) to that set, and is cleared whenever an edge is added.
+    _filtered_neighbours: dict[frozenset[str], set[_Vertex]]
+
+    __slots__ = ('price', 'rating_score', 'platform', '_filtered_neighbours')
 
     def __init__(self, item: Any, kind: str,
-                 price: float, rating_score: float, platform: list[str]) -> None:
+                 price: float, rating_score: float, platform: frozenset[str]) -> None:
         """Initialize a new vertex with the given item and kind.
 
         This vertex is initialized with no neighbours.
@@ -78,6 +116,25 @@ class _GameVertex(_Vertex):
         self.price = price
         self.rating_score = rating_score
         self.platform = platform
+        self._filtered_neighbours = {}
+
+    def add_neighbour(self, neighbour: _Vertex) -> None:
+        """Add neighbour to the neighbours of this vertex, and clear the cached values that
+        depend on them.
+        """
+        _Vertex.add_neighbour(self, neighbour)
+        self._filtered_neighbours.clear()
+
+    def filtered_neighbours(self, kinds: frozenset[str]) -> set[_Vertex]:
+        """Return the set of neighbours of this vertex whose kind is in kinds.
+
+        The result is cached, so the returned set must not be mutated.
+        """
+        if kinds not in self._filtered_neighbours:
+            self._filtered_neighbours[kinds] = \
+                set().union(*(self.neighbours_by_kind.get(kind, ()) for kind in kinds))
+
+        return self._filtered_neighbours[kinds]
 
     def similarity_score(self, other: _GameVertex, kinds: list[str]) -> float:
         """Return the similarity score between this _GameVertex and the other _GameVertex.
@@ -88,18 +145,16 @@ class _GameVertex(_Vertex):
         if self.degree() == 0 or other.degree() == 0:
             return 0.0
 
-        intersect = set()
-        union = {neighbour.item for neighbour in other.neighbours if neighbour.kind in kinds}
-        for x in self.neighbours:
-            if x.kind in kinds:
-                union.add(x.item)
-                if x in other.neighbours:
-                    intersect.add(x.item)
+        kinds_key = frozenset(kinds)
+        a = self.filtered_neighbours(kinds_key)
+        b = other.filtered_neighbours(kinds_key)
+        intersect = len(a & b)
+        union = len(a) + len(b) - intersect
 
-        if len(union) == 0:
+        if union == 0:
             return 0.0
         else:
-            return len(intersect) / len(union)
+            return intersect / union
 
 
 ############################################################################
@@ -112,16 +167,16 @@ class Graph:
     # Private Instance Attributes:
     #     - _vertices:
     #         A collection of the vertices contained in this graph.
-    #         Maps item to _Vertex object.
-    _vertices: dict[Any, Union[_Vertex, _GameVertex]]
+    #         Maps kind to a dict that maps item to _Vertex object.
+    _vertices: dict[str, dict[Any, Union[_Vertex, _GameVertex]]]
 
     def __init__(self) -> None:
         """Initialize an empty graph (no vertices or edges)."""
-        self._vertices = {}
+        self._vertices = {kind: {} for kind in ('game', 'developer', 'genre', 'category', 'tag')}
 
     def add_vertex(self, item: Any, kind: str,
                    price: Optional[float] = None, rating_score: Optional[float] = None,
-                   platform: Optional[list[str]] = None) -> None:
+                   platform: Optional[frozenset[str]] = None) -> None:
         """Add a vertex with the given item and kind to this graph.
 
         The new vertex is not adjacent to any other vertices.
@@ -130,12 +185,12 @@ class Graph:
         Preconditions:
             - kind in {'game', 'developer', 'genre', 'category', 'tag'}
         """
-        if (item, kind) not in self._vertices:
+        vertices = self._vertices[kind]
+        if item not in vertices:
             if kind == "game":
-                self._vertices[(item, kind)] \
-                    = _GameVertex((item, kind), kind, price, rating_score, platform)
+                vertices[item] = _GameVertex(item, kind, price, rating_score, platform)
             else:
-                self._vertices[(item, kind)] = _Vertex((item, kind), kind)
+                vertices[item] = _Vertex(item, kind)
 
     def add_edge(self, item1: Any, item2: Any, item1_kind: str, item2_kind: str) -> None:
         """Add an edge between the two vertices with the given items in this graph.
@@ -145,12 +200,12 @@ class Graph:
         Preconditions:
             - item1 != item2
         """
-        if (item1, item1_kind) in self._vertices and (item2, item2_kind) in self._vertices:
-            v1 = self._vertices[(item1, item1_kind)]
-            v2 = self._vertices[(item2, item2_kind)]
+        if item1 in self._vertices[item1_kind] and item2 in self._vertices[item2_kind]:
+            v1 = self._vertices[item1_kind][item1]
+            v2 = self._vertices[item2_kind][item2]
 
-            v1.neighbours.add(v2)
-            v2.neighbours.add(v1)
+            v1.add_neighbour(v2)
+            v2.add_neighbour(v1)
         else:
             raise ValueError
 
@@ -159,37 +214,38 @@ class Graph:
 
         Return False if item1 or item2 do not appear as vertices in this graph.
         """
-        if (item1, item1_kind) in self._vertices and (item2, item2_kind) in self._vertices:
-            v1 = self._vertices[(item1, item1_kind)]
-            return any(v2.item == (item2, item2_kind) for v2 in v1.neighbours)
+        if item1 in self._vertices[item1_kind] and item2 in self._vertices[item2_kind]:
+            v1 = self._vertices[item1_kind][item1]
+            return self._vertices[item2_kind][item2] in v1.neighbours_by_kind.get(item2_kind, ())
         else:
             return False
 
     def get_neighbours(self, item: Any, item_kind: str) -> set:
         """Return a set of the neighbours of the given item.
 
-        Items are returned, not the _Vertex objects themselves.
+        Items are returned with their kind as (item, kind), not the _Vertex objects themselves.
 
         Raise a ValueError if item does not appear as a vertex in this graph.
         """
-        if (item, item_kind) in self._vertices:
-            v = self._vertices[(item, item_kind)]
-            return {neighbour.item for neighbour in v.neighbours}
+        if item in self._vertices[item_kind]:
+            v = self._vertices[item_kind][item]
+            return {(neighbour.item, neighbour.kind) for neighbour in v.get_neighbours()}
         else:
             raise ValueError
 
     def get_all_vertices(self, kind: str = '') -> set:
         """Return a set of all vertex items in this graph.
 
-        If kind != '', only return the items of the given vertex kind.
+        If kind != '', only return the items of the given vertex kind. Otherwise, items are
+        returned with their kind as (item, kind).
 
         Preconditions:
             - kind in {'', 'game', 'developer', 'genre', 'category', 'tag'}
         """
         if kind != '':
-            return {v.item for v in self._vertices.values() if v.kind == kind}
+            return set(self._vertices[kind])
         else:
-            return set(self._vertices.keys())
+            return {(item, k) for k, vertices in self._vertices.items() for item in vertices}
 
     def get_filtered_game_vertices(self, max_price: Optional[float] = None,
                                    platforms: Optional[list[str]] = None,
@@ -197,27 +253,25 @@ class Graph:
         """Return a set of _GameVertex, only if _GameVertex met all the conditions
         inputted in the function. This includes max_price, platforms, and min_rating_score.
         """
-        games_so_far = set()
-        for v in self._vertices.values():
-            if v.kind != "game":
-                continue
-            if max_price and v.price > max_price:
-                continue
-            if platforms and all([platform not in platforms for platform in v.platform]):
-                continue
-            if min_rating_score and v.rating_score < min_rating_score:
-                continue
-            games_so_far.add(v)
-
-        return games_so_far
+        # Each active condition narrows the games in one pass, so inactive ones cost nothing
+        games_so_far = list(self._vertices["game"].values())
+        if max_price:
+            games_so_far = [v for v in games_so_far if v.price <= max_price]
+        if platforms:
+            platforms = set(platforms)
+            games_so_far = [v for v in games_so_far if not v.platform.isdisjoint(platforms)]
+        if min_rating_score:
+            games_so_far = [v for v in games_so_far if v.rating_score >= min_rating_score]
+
+        return set(games_so_far)
 
     def get_vertex(self, item: str, item_kind: str) -> Union[_GameVertex, _Vertex]:
         """Return the vertex of the given item.
 
         Raise ValueError if item not in self._vertices
         """
-        if (item, item_kind) in self._vertices:
-            return self._vertices[(item, item_kind)]
+        if item in self._vertices[item_kind]:
+            return self._vertices[item_kind][item]
         else:
             raise ValueError
 
@@ -227,11 +281,11 @@ class Graph:
 
         Raise a ValueError if item1 or item2 do not appear as vertices in this graph.
         """
-        if (item1, item1_kind) not in self._vertices or (item2, item2_kind) not in self._vertices:
+        if item1 not in self._vertices[item1_kind] or item2 not in self._vertices[item2_kind]:
             raise ValueError
         else:
-            v1 = self._vertices[(item1, item1_kind)]
-            v2 = self._vertices[(item2, item2_kind)]
+            v1 = self._vertices[item1_kind][item1]
+            v2 = self._vertices[item2_kind][item2]
 
             return v1.similarity_score(v2, kinds)
 
@@ -260,26 +314,43 @@ class Graph:
         then the second-highest similarity score, etc.
 
         Preconditions:
-            - game in self._vertices
-            - self._vertices[game].kind == 'game'
+            - game[0] in self._vertices['game']
             - limit >= 1
         """
         all_games = self.get_filtered_game_vertices(max_price, platforms, min_rating_score)
 
+        return self._recommend_games(game, kinds, all_games)
+
+    def _recommend_games(self, game: tuple[str, str], kinds: list[str],
+                         all_games: set[_GameVertex]) -> list[tuple]:
+        """Return a list of recommended games based on similarity to the given game, only
+        including the games in all_games.
+
+        all_games is the result of get_filtered_game_vertices, so it can be shared between
+        calls that use the same conditions. See recommend_games for the return value.
+
+        Preconditions:
+            - game[0] in self._vertices['game']
+        """
         game_vertex = self.get_vertex(game[0], "game")
-        if game_vertex in all_games:
-            all_games.remove(game_vertex)
-
-        game_dict = {}
-        for game1 in all_games:
-            similarity_score = \
-                self.get_similarity_score(game[0], game1.item[0], "game", "game", kinds)
-            if similarity_score == 0:
+
+        # Count the neighbours each game shares with game by walking game's neighbours,
+        # so games with no shared neighbour (a similarity score of 0) are never visited
+        kinds_key = frozenset(kinds)
+        query_neighbours = game_vertex.filtered_neighbours(kinds_key)
+        intersect_counts = Counter()
+        for neighbour in query_neighbours:
+            intersect_counts.update(neighbour.neighbours_by_kind.get("game", ()))
+        del intersect_counts[game_vertex]
+
+        query_degree = len(query_neighbours)
+        # Every counted game shares at least one neighbour, so no score here is 0
+        game_dict = defaultdict(list)
+        for game1, intersect in intersect_counts.items():
+            if game1 not in all_games:
                 continue
-            elif similarity_score in game_dict:
-                game_dict[similarity_score].append(game1.item[0])
-            else:
-                game_dict[similarity_score] = [game1.item[0]]
+            union = query_degree + game1.kind_degree(kinds_key) - intersect
+            game_dict[intersect / union].append(game1.item)
 
         list_of_games_with_score = []
         for score in sorted(game_dict.keys(), reverse=True):
@@ -313,31 +384,30 @@ class Graph:
         and only if there aren't enough games that meet the above criteria.
 
         Preconditions:
-            - game in self._vertices
-            - self._vertices[game].kind == 'game'
+            - all(game[0] in self._vertices['game'] for game in input_game_list)
             - limit >= 1
         """
+        all_games = self.get_filtered_game_vertices(max_price, platforms, min_rating_score)
+
+        # Maps game name to its recommended games, so repeated input games are computed once
+        recommendations = {}
         list_of_games_with_score = []
         for game_tuple in input_game_list:
-            list_of_games = \
-                self.recommend_games(game_tuple, kinds, max_price, platforms, min_rating_score)
-            list_of_games_with_score.extend(list_of_games)
-
-        game_dict = {}
+            if game_tuple[0] not in recommendations:
+                recommendations[game_tuple[0]] = \
+                    self._recommend_games(game_tuple, kinds, all_games)
+            list_of_games_with_score.extend(recommendations[game_tuple[0]])
+
+        input_names = {game_tuple[0] for game_tuple in input_game_list}
+        scores = defaultdict(float)
+        counters = defaultdict(int)
         for game_tup in list_of_games_with_score:
-            if game_tup[0] in input_game_list:
+            if game_tup[0] in input_names:
                 continue
-            if game_tup[0] in game_dict:
-                game_dict[game_tup[0]]["similarity_score"] += game_tup[1]
-                game_dict[game_tup[0]]["counter"] += 1
-            else:
-                game_dict[game_tup[0]] = {"similarity_score": game_tup[1], "counter": 1}
-
-        sorted_game_list = sorted(game_dict, key=lambda k: (game_dict[k]["counter"],
-                                                            game_dict[k]["similarity_score"]),
-                                  reverse=True)
+            scores[game_tup[0]] += game_tup[1]
+            counters[game_tup[0]] += 1
 
-        return sorted_game_list[:limit]
+        return heapq.nlargest(limit, counters, key=lambda k: (counters[k], scores[k]))
 
 
 # if __name__ == '__main__':
@@ -10,7 +10,8 @@ def display_result(graph: compute.Graph, recommended_list: list) -> None:
         print(f'{index + 1} {game}')
         print(f'\tprice: {game_vertex.price}')
         print(f'\trating_score: {game_vertex.rating_score}')
-        print(f'\tplatform: {game_vertex.platform}')
+        platforms = [p for p in ('windows', 'mac', 'linux') if p in game_vertex.platform]
+        print(f'\tplatform: {platforms}')
 
 
 # if __name__ == '__main__':
@@ -1,7 +1,13 @@
 """Read"""
+import re
+import sys
+from typing import Iterable
 import pandas as pd
 import compute
 
+# Separators between the developers, categories, tags, and genres of a game
+_SEP = re.compile(r'[/;]')
+
 
 def read_process(input_csv: str) -> pd.DataFrame:
     """Return a data frame corresponding to steam.csv dataset.
@@ -16,6 +22,9 @@ def read_process(input_csv: str) -> pd.DataFrame:
     positive_ratings and negative_ratings of each game and get the total positive ratings
     percentage.
 
+    The 'developer', 'categories', 'steamspy_tags', and 'genres' columns are split into lists,
+    using both "/" and ";" as separators.
+
     Preconditions:
         - input_csv is the path to a CSV file corresponding to the steam.csv
     """
@@ -29,9 +38,24 @@ def read_process(input_csv: str) -> pd.DataFrame:
     df["rating_score"] \
         = df['positive_ratings'] / (df['positive_ratings'] + df['negative_ratings']) * 100
 
+    # 3. Split the developers, categories, tags, and genres into lists
+    for column in ['developer', 'categories', 'steamspy_tags', 'genres']:
+        df[column] = df[column].map(split_attributes)
+
     return df
 
 
+def split_attributes(attributes: str) -> list[str]:
+    """Return the list of developers, categories, tags, or genres in attributes.
+
+    Each one is interned, since only a few hundred distinct values are shared by every game.
+
+    >>> split_attributes("Action;Free to Play/Indie")
+    ['Action', 'Free to Play', 'Indie']
+    """
+    return [sys.intern(attribute) for attribute in _SEP.split(attributes)]
+
+
 def load_game_graph(file: str) -> compute.Graph:
     """Return a game graph corresponding to the steam.csv.
 
@@ -50,42 +74,32 @@ def load_game_graph(file: str) -> compute.Graph:
     """
     graph = compute.Graph()
     df = read_process(file)
-    df.apply(lambda row: process_row(graph, row), axis=1)
 
-    return graph
-
-
-def process_row(graph: compute.Graph, row: pd.DataFrame) -> None:
-    """A helper function for load_game_graph that process the dataframe given a row.
-
-    Process_row will take in the game, developer, genre, category, and tag and create a vertex
-    based on each kinds, and create an edge between the game and the kinds.
-    """
-    graph.add_vertex(row["name"], "game", row.price,
-                     row.rating_score, row.platforms.split(";"))
-
-    list_of_developers = row.developer.replace("/", ";").split(";")
-    add_game_neighbours(graph, list_of_developers, "developer", row["name"])
+    for name, price, rating_score, platforms in zip(df['name'].to_numpy(),
+                                                    df['price'].to_numpy(),
+                                                    df['rating_score'].to_numpy(),
+                                                    df['platforms'].to_numpy()):
+        graph.add_vertex(name, "game", price, rating_score, frozenset(platforms.split(";")))
 
-    list_of_categories = row.categories.replace("/", ";").split(";")
-    add_game_neighbours(graph, list_of_categories, "category", row["name"])
+    for column, kind in [('developer', 'developer'), ('categories', 'category'),
+                         ('steamspy_tags', 'tag'), ('genres', 'genre')]:
+        edges = df[['name', column]].explode(column)
+        add_game_neighbours(graph, edges['name'].to_numpy(), edges[column].to_numpy(), kind)
 
-    list_of_tags = row.steamspy_tags.replace("/", ";").split(";")
-    add_game_neighbours(graph, list_of_tags, "tag", row["name"])
-
-    list_of_genres = row.genres.replace("/", ";").split(";")
-    add_game_neighbours(graph, list_of_genres, "genre", row["name"])
+    return graph
 
 
-def add_game_neighbours(graph: compute.Graph, vertex_list: list, kind: str, game: str) -> None:
-    """A helper function for process_row to create a vertex for each kinds from a list,
-    and create an edge between the game and the kinds.
+def add_game_neighbours(graph: compute.Graph, games: Iterable[str], vertex_list: Iterable[str],
+                        kind: str) -> None:
+    """A helper function for load_game_graph to create a vertex for each kinds from vertex_list,
+    and create an edge between each game and the kind at the same position.
 
     Preconditions:
+        - len(games) == len(vertex_list)
         - all kind in vertex_list should be the same
         - kind in ['developer', 'genre', 'category', 'tag']
     """
-    for element in vertex_list:
+    for game, element in zip(games, vertex_list):
         graph.add_vertex(element, kind)
         graph.add_edge(game, element, "game", kind)
 
@@ -94,7 +108,7 @@ if __name__ == '__main__':
     import python_ta
 
     python_ta.check_all(config={
-        'extra-imports': ['pandas', 'compute'],  # the names (strs) of imported modules
+        'extra-imports': ['re', 'sys', 'pandas', 'compute'],  # the names (strs) of imported modules
         'allowed-io': [],  # the names (strs) of functions that call print/open/input
         'max-line-length': 100,
         'disable': ['E1136']